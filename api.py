@@ -53,7 +53,7 @@ def scrape_acionistas(ticker: str, tipo: int = 1) -> JSONResponse:
     if tipo not in {1, 2}:
         raise HTTPException(status_code=400, detail="tipo must be 1 or 2")
 
-    scraper = FundamentusAcionistasScraper(tickers=[t], tipo=tipo)
+    scraper = FundamentusAcionistasScraper(tickers=(t,), tipo=tipo)
     items = scraper.scrape()
 
     if not items:
@@ -80,7 +80,7 @@ def scrape_insiders(ticker: str, tipo: int = 1) -> JSONResponse:
     if tipo not in {1, 2}:
         raise HTTPException(status_code=400, detail="tipo must be 1 or 2")
 
-    scraper = FundamentusInsidersScraper(tickers=[t], tipo=tipo)
+    scraper = FundamentusInsidersScraper(tickers=(t,), tipo=tipo)
     items = scraper.scrape()
 
     if not items:
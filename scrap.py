@@ -1,68 +1,33 @@
 import argparse
-import json
+import asyncio
+import os
+from collections import defaultdict
 from datetime import datetime, timezone
 from pathlib import Path
 
-import requests
-import yaml
-
+from scrapers._http import make_session
 from scrapers.fundamentus_insiders import FundamentusInsidersScraper
 from scrapers.fundamentus_acionistas import FundamentusAcionistasScraper
 from scrapers.bestchoice_volume import BestChoiceVolumeScraper
 from scrapers.bestchoice_magic_formula import BestChoiceMagicFormulaScraper
 from scrapers.statusinvest_prices import StatusInvestPricesScraper
 from sharks import build_sharks
+from utils import get_tickers, json_dumps, load_yaml
 
 
-def _normalize_tickers(tickers: object) -> list[str]:
-    if not isinstance(tickers, list):
-        return []
-
-    result: list[str] = []
-    seen: set[str] = set()
-    for t in tickers:
-        v = str(t or "").strip().upper()
-        if not v or v in seen:
-            continue
-        seen.add(v)
-        result.append(v)
-    return result
-
-
-def _fetch_tickers_from_endpoint(url: str) -> list[str]:
-    u = str(url or "").strip()
-    if not u:
-        return []
-
-    resp = requests.get(u, timeout=10)
-    resp.raise_for_status()
-    payload = resp.json()
-    tickers = payload.get("tickers") if isinstance(payload, dict) else None
-    return _normalize_tickers(tickers)
-
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    # Write to a sibling temp file and rename so a crash mid-write never
+    # leaves a truncated output behind.
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
 
-def _get_tickers(config: dict, site_cfg: dict) -> list[str]:
-    endpoint = site_cfg.get("tickers_endpoint") or config.get("tickers_endpoint")
-    if endpoint:
-        try:
-            from_endpoint = _fetch_tickers_from_endpoint(str(endpoint))
-            if from_endpoint:
-                return from_endpoint
-        except Exception:
-            pass
 
-    tickers = site_cfg.get("tickers")
-    if tickers is None:
-        tickers = config.get("tickers", [])
-    return _normalize_tickers(tickers)
+_MD_TRANS = str.maketrans({"|": "\\|", "\r": "", "\n": "<br>"})
 
 
 def _md_escape(value: object) -> str:
-    s = "" if value is None else str(value)
-    s = s.replace("\r\n", "\n").replace("\r", "\n")
-    s = s.replace("|", "\\|")
-    s = s.replace("\n", "<br>")
-    return s
+    return "" if value is None else str(value).translate(_MD_TRANS)
 
 
 def _md_table(rows: list[dict]) -> str:
@@ -83,14 +48,16 @@ def _md_table(rows: list[dict]) -> str:
     if not cols:
         return "(sem dados)\n"
 
-    header = "| " + " | ".join(_md_escape(c) for c in cols) + " |\n"
-    sep = "| " + " | ".join(["---"] * len(cols)) + " |\n"
-    body_lines: list[str] = []
+    lines = [
+        "| " + " | ".join(_md_escape(c) for c in cols) + " |\n",
+        "| " + " | ".join(["---"] * len(cols)) + " |\n",
+    ]
+    append = lines.append
     for r in rows:
         if not isinstance(r, dict):
             continue
-        body_lines.append("| " + " | ".join(_md_escape(r.get(c)) for c in cols) + " |\n")
-    return header + sep + "".join(body_lines)
+        append("| " + " | ".join(_md_escape(r.get(c)) for c in cols) + " |\n")
+    return "".join(lines)
 
 
 def _md_kv_table(item: dict) -> str:
@@ -131,53 +98,63 @@ def _to_markdown(payload: dict) -> str:
     return md
 
 
-def run(config: dict) -> list[dict]:
-    results: list[dict] = []
-
+async def _run_all(config: dict) -> list[dict]:
     sites = config.get("sites", {}) or {}
 
-    site_cfg = sites.get("fundamentus_insiders", {}) or {}
-    if site_cfg.get("enabled", True):
-        scraper = FundamentusInsidersScraper(
-            tickers=_get_tickers(config, site_cfg),
-            tipo=int(site_cfg.get("tipo", 1)),
-        )
-        results.extend(scraper.scrape())
-
-    site_cfg = sites.get("fundamentus_acionistas", {}) or {}
-    if site_cfg.get("enabled", True):
-        scraper = FundamentusAcionistasScraper(
-            tickers=_get_tickers(config, site_cfg),
-            tipo=int(site_cfg.get("tipo", 1)),
-        )
-        results.extend(scraper.scrape())
-
-    site_cfg = sites.get("bestchoice_volume", {}) or {}
-    if site_cfg.get("enabled", True):
-        scraper = BestChoiceVolumeScraper(
-            tickers=_get_tickers(config, site_cfg),
-            tipo=str(site_cfg.get("tipo", "stock")),
-        )
-        results.extend(scraper.scrape())
-
-    site_cfg = sites.get("bestchoice_magic_formula", {}) or {}
-    if site_cfg.get("enabled", True):
-        scraper = BestChoiceMagicFormulaScraper()
-        results.extend(scraper.scrape())
-
-    site_cfg = sites.get("statusinvest_prices", {}) or {}
-    if site_cfg.get("enabled", True):
-        scraper = StatusInvestPricesScraper(
-            tickers=_get_tickers(config, site_cfg),
-            cookie=site_cfg.get("cookie"),
-            storage_state_path=site_cfg.get("storage_state_path"),
-            use_browser_fallback=bool(site_cfg.get("use_browser_fallback", True)),
-        )
-        results.extend(scraper.scrape())
+    async with make_session() as session:
+        tasks = []
+
+        site_cfg = sites.get("fundamentus_insiders", {}) or {}
+        if site_cfg.get("enabled", True):
+            scraper = FundamentusInsidersScraper(
+                tickers=get_tickers(config, site_cfg),
+                tipo=int(site_cfg.get("tipo", 1)),
+            )
+            tasks.append(scraper.scrape_async(session))
+
+        site_cfg = sites.get("fundamentus_acionistas", {}) or {}
+        if site_cfg.get("enabled", True):
+            scraper = FundamentusAcionistasScraper(
+                tickers=get_tickers(config, site_cfg),
+                tipo=int(site_cfg.get("tipo", 1)),
+            )
+            tasks.append(scraper.scrape_async(session))
+
+        site_cfg = sites.get("bestchoice_volume", {}) or {}
+        if site_cfg.get("enabled", True):
+            scraper = BestChoiceVolumeScraper(
+                tickers=get_tickers(config, site_cfg),
+                tipo=str(site_cfg.get("tipo", "stock")),
+            )
+            tasks.append(scraper.scrape_async(session))
+
+        site_cfg = sites.get("bestchoice_magic_formula", {}) or {}
+        if site_cfg.get("enabled", True):
+            scraper = BestChoiceMagicFormulaScraper()
+            tasks.append(scraper.scrape_async(session))
+
+        site_cfg = sites.get("statusinvest_prices", {}) or {}
+        if site_cfg.get("enabled", True):
+            scraper = StatusInvestPricesScraper(
+                tickers=get_tickers(config, site_cfg),
+                cookie=site_cfg.get("cookie"),
+                storage_state_path=site_cfg.get("storage_state_path"),
+                use_browser_fallback=bool(site_cfg.get("use_browser_fallback", True)),
+            )
+            tasks.append(scraper.scrape_async(session))
+
+        groups = await asyncio.gather(*tasks)
 
+    results: list[dict] = []
+    for group in groups:
+        results.extend(group)
     return results
 
 
+def run(config: dict) -> list[dict]:
+    return asyncio.run(_run_all(config))
+
+
 def main() -> int:
     parser = argparse.ArgumentParser()
     parser.add_argument("--config", default="config.yaml")
@@ -185,7 +162,7 @@ def main() -> int:
     args = parser.parse_args()
 
     cfg_path = Path(args.config)
-    config = yaml.safe_load(cfg_path.read_text(encoding="utf-8")) or {}
+    config = load_yaml(cfg_path)
 
     out_dir = Path(args.out or config.get("output_dir") or "outputs")
     out_dir.mkdir(parents=True, exist_ok=True)
@@ -197,45 +174,51 @@ def main() -> int:
     generated_at = datetime.now(timezone.utc).isoformat()
     items = run(config)
 
-    by_key: dict[tuple[str, str], list[dict]] = {}
+    volume_buckets: defaultdict[str, list[dict]] = defaultdict(list)
+    magic_buckets: defaultdict[str, list[dict]] = defaultdict(list)
+    other: defaultdict[tuple[str, str], list[dict]] = defaultdict(list)
+    # Scrapers already emit upper-case tickers and lower-case sources, so
+    # only guard against missing keys instead of re-normalizing every item.
     for item in items:
-        ticker = str(item.get("ticker") or "").strip().upper() or "UNKNOWN"
-        source = str(item.get("source") or "data").strip().lower() or "data"
-        by_key.setdefault((ticker, source), []).append(item)
-
-    volume_map: dict[str, dict] = {}
-    magic_formula_map: dict[str, dict] = {}
-    for (ticker, source), ticker_items in sorted(by_key.items()):
+        tk = item.get("ticker")
+        ticker = tk if isinstance(tk, str) and tk else "UNKNOWN"
+        src = item.get("source")
+        source = src if isinstance(src, str) and src else "data"
         if source == "volume":
-            if len(ticker_items) == 1:
-                volume_map[ticker] = ticker_items[0]
-            else:
-                volume_map[ticker] = {"items": ticker_items}
-            continue
-
-        if source == "magic_formula":
-            if len(ticker_items) == 1:
-                magic_formula_map[ticker] = ticker_items[0]
-            else:
-                magic_formula_map[ticker] = {"items": ticker_items}
-            continue
-
-        payload = {
-            "generated_at": generated_at,
-            "ticker": ticker,
-            "source": source,
-            "items": ticker_items,
-        }
+            volume_buckets[ticker].append(item)
+        elif source == "magic_formula":
+            magic_buckets[ticker].append(item)
+        else:
+            other[(ticker, source)].append(item)
+
+    volume_map: dict[str, dict] = {
+        ticker: bucket[0] if len(bucket) == 1 else {"items": bucket}
+        for ticker, bucket in sorted(volume_buckets.items())
+    }
+    magic_formula_map: dict[str, dict] = {
+        ticker: bucket[0] if len(bucket) == 1 else {"items": bucket}
+        for ticker, bucket in sorted(magic_buckets.items())
+    }
+
+    # One reusable payload dict; each iteration serializes it immediately,
+    # so mutating the three varying fields in place is safe single-threaded.
+    payload = {
+        "generated_at": generated_at,
+        "ticker": "",
+        "source": "",
+        "items": None,
+    }
+    for (ticker, source), ticker_items in sorted(other.items()):
+        payload["ticker"] = ticker
+        payload["source"] = source
+        payload["items"] = ticker_items
 
         if output_format == "md":
             out_path = out_dir / f"{ticker.lower()}.{source}.md"
-            out_path.write_text(_to_markdown(payload), encoding="utf-8")
+            _atomic_write_bytes(out_path, _to_markdown(payload).encode("utf-8"))
         else:
             out_path = out_dir / f"{ticker.lower()}.{source}.json"
-            out_path.write_text(
-                json.dumps(payload, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
+            _atomic_write_bytes(out_path, json_dumps(payload))
 
         print(f"Wrote {out_path} ({len(ticker_items)} items)")
 
@@ -248,12 +231,9 @@ def main() -> int:
         }
 
         if output_format == "md":
-            out_path.write_text(_to_markdown(payload), encoding="utf-8")
+            _atomic_write_bytes(out_path, _to_markdown(payload).encode("utf-8"))
         else:
-            out_path.write_text(
-                json.dumps(payload, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
+            _atomic_write_bytes(out_path, json_dumps(payload))
         print(f"Wrote {out_path} ({len(volume_map)} tickers)")
 
     if magic_formula_map:
@@ -265,21 +245,15 @@ def main() -> int:
         }
 
         if output_format == "md":
-            out_path.write_text(_to_markdown(payload), encoding="utf-8")
+            _atomic_write_bytes(out_path, _to_markdown(payload).encode("utf-8"))
         else:
-            out_path.write_text(
-                json.dumps(payload, ensure_ascii=False, indent=2),
-                encoding="utf-8",
-            )
+            _atomic_write_bytes(out_path, json_dumps(payload))
         print(f"Wrote {out_path} ({len(magic_formula_map)} tickers)")
 
     sharks = build_sharks(out_dir)
     if sharks:
         out_path = out_dir / "sharks.json"
-        out_path.write_text(
-            json.dumps(sharks, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        _atomic_write_bytes(out_path, json_dumps(sharks))
         print(f"Wrote {out_path} ({len(sharks)} sharks)")
 
     if not items:
@@ -0,0 +1,59 @@
+"""Small on-disk TTL cache for scraper responses.
+
+Entries live under .cache/<namespace>/<md5>.json as a {"ts", "body"}
+envelope. Set SCRAPER_NO_CACHE=1 to bypass reads and writes entirely.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+
+_CACHE_ROOT = Path(".cache")
+
+
+def _disabled() -> bool:
+    return os.environ.get("SCRAPER_NO_CACHE", "").strip().lower() in {"1", "true", "yes"}
+
+
+def _path_for(namespace: str, key: str) -> Path:
+    digest = hashlib.md5(key.encode("utf-8")).hexdigest()
+    return _CACHE_ROOT / namespace / f"{digest}.json"
+
+
+def get(namespace: str, key: str, ttl: float) -> str | None:
+    """Return the cached body for key, or None if absent/expired/disabled."""
+    if _disabled():
+        return None
+
+    try:
+        envelope = json.loads(_path_for(namespace, key).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+    ts = envelope.get("ts")
+    if not isinstance(ts, (int, float)) or time.time() - ts > ttl:
+        return None
+
+    body = envelope.get("body")
+    return body if isinstance(body, str) else None
+
+
+def put(namespace: str, key: str, body: str) -> None:
+    if _disabled():
+        return
+
+    p = _path_for(namespace, key)
+    try:
+        p.parent.mkdir(parents=True, exist_ok=True)
+        tmp = p.with_suffix(p.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps({"ts": time.time(), "body": body}, ensure_ascii=False),
+            encoding="utf-8",
+        )
+        os.replace(tmp, p)
+    except OSError:
+        # Caching is best-effort; never fail a scrape over it.
+        pass
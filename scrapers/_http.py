@@ -0,0 +1,24 @@
+"""Shared aiohttp session setup for the scrapers."""
+from __future__ import annotations
+
+import aiohttp
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/122.0.0.0 Safari/537.36"
+    ),
+    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+}
+
+
+def make_session() -> aiohttp.ClientSession:
+    """Build one keep-alive connection pool to share across scrapers.
+
+    Reusing a single session amortizes the TCP/TLS handshakes across all
+    tickers instead of paying one per request, and sets the constant
+    browser-like headers once instead of rebuilding them per call.
+    """
+    connector = aiohttp.TCPConnector(limit=20, limit_per_host=8)
+    return aiohttp.ClientSession(connector=connector, headers=DEFAULT_HEADERS)
@@ -1,26 +1,28 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Any
 
-import requests
+import aiohttp
 
+from scrapers._http import make_session
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class BestChoiceMagicFormulaScraper:
-    def scrape(self) -> list[dict[str, Any]]:
+    async def scrape_async(
+        self, session: aiohttp.ClientSession | None = None
+    ) -> list[dict[str, Any]]:
+        if session is None:
+            async with make_session() as own_session:
+                return await self.scrape_async(own_session)
+
         url = "https://n8n.semalo.com.br/webhook/magic"
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            )
-        }
 
-        resp = requests.get(url, headers=headers, timeout=60)
-        resp.raise_for_status()
-        data = resp.json()
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as resp:
+            resp.raise_for_status()
+            data = await resp.json()
         if not isinstance(data, list):
             return []
 
@@ -43,3 +45,6 @@ class BestChoiceMagicFormulaScraper:
             )
 
         return items
+
+    def scrape(self) -> list[dict[str, Any]]:
+        return asyncio.run(self.scrape_async())
@@ -1,18 +1,43 @@
 from __future__ import annotations
 
+import asyncio
 from dataclasses import dataclass
 from typing import Any
 
-import requests
+import aiohttp
 
+from scrapers._http import make_session
 
-@dataclass(frozen=True)
+# Max tickers per scanner request; keeps payloads well under any in_range cap.
+_BATCH_SIZE = 50
+
+
+def _to_int(v: Any) -> int | None:
+    try:
+        if v is None or v == "":
+            return None
+        return int(round(float(v)))
+    except (ValueError, TypeError):
+        return None
+
+
+def _to_float(v: Any) -> float | None:
+    try:
+        if v is None or v == "":
+            return None
+        return float(v)
+    except (ValueError, TypeError):
+        return None
+
+
+@dataclass(frozen=True, slots=True)
 class BestChoiceVolumeScraper:
-    tickers: list[str]
+    # Expected pre-canonicalized (stripped, uppercased, deduped) by the caller.
+    tickers: tuple[str, ...]
     tipo: str = "stock"  # stock | dr
 
-    def _payload_for_ticker(self, ticker: str) -> dict[str, Any]:
-        # Query each ticker directly. This avoids the strong filters used in the UI
+    def _payload_for_tickers(self, tickers: tuple[str, ...]) -> dict[str, Any]:
+        # Query the tickers directly. This avoids the strong filters used in the UI
         # that can exclude tickers and result in empty output.
         return {
             "columns": [
@@ -32,98 +57,127 @@ class BestChoiceVolumeScraper:
             ],
             "filter": [
                 {"left": "type", "operation": "equal", "right": self.tipo},
-                {"left": "name", "operation": "equal", "right": ticker},
+                {"left": "name", "operation": "in_range", "right": list(tickers)},
             ],
             "options": {"lang": "pt"},
-            "range": [0, 1],
+            "range": [0, len(tickers)],
             "sort": {"sortBy": "name", "sortOrder": "asc"},
             "symbols": {},
             "markets": ["brazil"],
         }
 
-    @staticmethod
-    def _to_int(v: Any) -> int | None:
-        try:
-            if v is None or v == "":
-                return None
-            return int(round(float(v)))
-        except (ValueError, TypeError):
+    async def _fetch_rows(
+        self, session: aiohttp.ClientSession, payload: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        url = "https://bestchoice-serverless.netlify.app/.netlify/functions/post"
+        headers = {"x-target-url": "https://scanner.tradingview.com/brazil/scan"}
+
+        async with session.post(
+            url, json=payload, headers=headers, timeout=aiohttp.ClientTimeout(total=60)
+        ) as resp:
+            resp.raise_for_status()
+            data = await resp.json() or {}
+        return data.get("data", []) or []
+
+    def _build_item(self, d: list[Any], ticker: str) -> dict[str, Any] | None:
+        if not d or len(d) < 13:
             return None
 
-    @staticmethod
-    def _to_float(v: Any) -> float | None:
-        try:
-            if v is None or v == "":
-                return None
-            return float(v)
-        except (ValueError, TypeError):
+        # Columns order (see _payload_for_tickers)
+        (
+            name,
+            description,
+            _type,
+            exchange,
+            close,
+            change,
+            volume_raw,
+            volume_change,
+            avg30_raw,
+            avg10_raw,
+            rec_mark,
+            net_margin,
+            div_yield,
+        ) = d[:13]
+
+        name = str(name or "").strip().upper()
+        if name != ticker:
             return None
 
-    def _fetch_rows(self, payload: dict[str, Any]) -> list[dict[str, Any]]:
-        url = "https://bestchoice-serverless.netlify.app/.netlify/functions/post"
-        headers = {
-            "Content-Type": "application/json",
-            "x-target-url": "https://scanner.tradingview.com/brazil/scan",
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            ),
+        volume = _to_int(volume_raw)
+        avg30 = _to_int(avg30_raw)
+        avg10 = _to_int(avg10_raw)
+        volume_change_ratio = None
+        if volume and avg30:
+            volume_change_ratio = _to_float(volume / avg30)
+
+        return {
+            "site": "bestchoice",
+            "source": "volume",
+            "ticker": name,
+            "tipo": self.tipo,
+            "description": description,
+            "exchange": exchange,
+            "close": _to_float(close),
+            "change": _to_float(change),
+            "volume": volume,
+            "volume_change": _to_float(volume_change),
+            "volume_change_ratio": volume_change_ratio,
+            "average_volume_30d": avg30,
+            "average_volume_10d": avg10,
+            "recommendation_mark": _to_float(rec_mark),
+            "net_margin_fy": _to_float(net_margin),
+            "dividends_yield_current": _to_float(div_yield),
         }
 
-        resp = requests.post(url, json=payload, headers=headers, timeout=60)
-        resp.raise_for_status()
-        data = resp.json() or {}
-        return data.get("data", []) or []
+    async def _scrape_chunk(
+        self, session: aiohttp.ClientSession, tickers: tuple[str, ...]
+    ) -> list[dict[str, Any]]:
+        rows = await self._fetch_rows(session, self._payload_for_tickers(tickers))
 
-    def scrape(self) -> list[dict[str, Any]]:
-        wanted = {str(t or "").strip().upper() for t in self.tickers}
-        wanted.discard("")
-        if not wanted:
-            return []
+        by_name: dict[str, list[Any]] = {}
+        for row in rows:
+            d = row.get("d") or []
+            if d:
+                name = str(d[0] or "").strip().upper()
+                if name and name not in by_name:
+                    by_name[name] = d
 
         items: list[dict[str, Any]] = []
-        for ticker in sorted(wanted):
-            rows = self._fetch_rows(self._payload_for_ticker(ticker))
-            if not rows:
+        for ticker in tickers:
+            d = by_name.get(ticker)
+            if d is None:
                 continue
+            item = self._build_item(d, ticker)
+            if item:
+                items.append(item)
+        return items
 
-            row = rows[0]
-            d = row.get("d") or []
-            if not d or len(d) < 13:
-                continue
+    async def scrape_async(
+        self, session: aiohttp.ClientSession | None = None
+    ) -> list[dict[str, Any]]:
+        if session is None:
+            async with make_session() as own_session:
+                return await self.scrape_async(own_session)
 
-            # Columns order (see _payload_for_ticker)
-            name = str(d[0] or "").strip().upper()
-            if name != ticker:
-                continue
+        if not self.tickers:
+            return []
 
-            volume = self._to_int(d[6])
-            avg30 = self._to_int(d[8])
-            avg10 = self._to_int(d[9])
-            volume_change_ratio = None
-            if volume and avg30:
-                volume_change_ratio = self._to_float(volume / avg30)
-
-            items.append(
-                {
-                    "site": "bestchoice",
-                    "source": "volume",
-                    "ticker": name,
-                    "tipo": self.tipo,
-                    "description": d[1],
-                    "exchange": d[3],
-                    "close": self._to_float(d[4]),
-                    "change": self._to_float(d[5]),
-                    "volume": volume,
-                    "volume_change": self._to_float(d[7]),
-                    "volume_change_ratio": volume_change_ratio,
-                    "average_volume_30d": avg30,
-                    "average_volume_10d": avg10,
-                    "recommendation_mark": self._to_float(d[10]),
-                    "net_margin_fy": self._to_float(d[11]),
-                    "dividends_yield_current": self._to_float(d[12]),
-                }
-            )
+        chunks = [
+            self.tickers[i : i + _BATCH_SIZE]
+            for i in range(0, len(self.tickers), _BATCH_SIZE)
+        ]
+        results = await asyncio.gather(
+            *(self._scrape_chunk(session, chunk) for chunk in chunks),
+            return_exceptions=True,
+        )
 
+        items: list[dict[str, Any]] = []
+        for res in results:
+            if isinstance(res, BaseException):
+                continue
+            items.extend(res)
         return items
+
+    def scrape(self) -> list[dict[str, Any]]:
+        return asyncio.run(self.scrape_async())
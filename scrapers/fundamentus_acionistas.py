@@ -1,15 +1,51 @@
 from __future__ import annotations
 
+import asyncio
+import os
+import re
 from dataclasses import dataclass
+from html import unescape
 from typing import Any
 
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+from selectolax.parser import HTMLParser
 
+from scrapers._http import make_session
 
-@dataclass(frozen=True)
+# Drops "%", spaces and thousands "." and maps decimal "," to "." in one
+# C-level pass instead of chained .replace() copies.
+_PT_PERCENT_TRANS = str.maketrans(
+    {"%": "", ".": "", " ": "", "\xa0": "", ",": "."}
+)
+
+# See fundamentus_insiders: "regex" extracts rows straight from the raw
+# bytes, the DOM parse stays as the fallback when the regex finds nothing.
+_HTML_MODE = os.environ.get("FUNDAMENTUS_HTML_MODE", "regex")
+
+_ROW_RE = re.compile(
+    rb"<tr[^>]*>\s*"
+    rb"<td[^>]*>([^<]*)</td>\s*"
+    rb"<td[^>]*>([^<]*)</td>"
+)
+
+
+def _iter_table_slices(html: bytes):
+    start = 0
+    while True:
+        i = html.find(b"<table", start)
+        if i == -1:
+            return
+        j = html.find(b"</table>", i)
+        if j == -1:
+            return
+        yield html[i:j]
+        start = j + len(b"</table>")
+
+
+@dataclass(frozen=True, slots=True)
 class FundamentusAcionistasScraper:
-    tickers: list[str]
+    # Expected pre-canonicalized (stripped, uppercased, deduped) by the caller.
+    tickers: tuple[str, ...]
     tipo: int = 1
 
     def _build_url(self, ticker: str) -> str:
@@ -18,28 +54,19 @@ class FundamentusAcionistasScraper:
             f"?papel={ticker}&tipo={self.tipo}"
         )
 
-    def _fetch(self, url: str) -> str:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-        }
-        resp = requests.get(url, headers=headers, timeout=30)
-        resp.raise_for_status()
-        return resp.text
+    async def _fetch_async(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        # Return the raw body; selectolax handles charset detection in C,
+        # so decoding to str here would just add a full extra pass.
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
+            resp.raise_for_status()
+            return await resp.read()
 
     @staticmethod
     def _parse_percent_pt(value: str) -> float | None:
-        v = (value or "").strip()
+        v = (value or "").translate(_PT_PERCENT_TRANS)
         if not v:
             return None
 
-        v = v.replace("%", "").strip()
-        v = v.replace(".", "").replace(",", ".")
-
         try:
             return float(v)
         except ValueError:
@@ -47,14 +74,13 @@ class FundamentusAcionistasScraper:
 
     @staticmethod
     def _is_target_table(table: Any) -> bool:
-        try:
-            headers = [
-                th.get_text(strip=True).lower()
-                for th in (table.find_all("th") or [])
-            ]
-        except Exception:
+        # Only the first row carries the headers; checking it alone skips
+        # walking every cell of unrelated tables on the page.
+        first_row = table.css_first("tr")
+        if first_row is None:
             return False
 
+        headers = [th.text(strip=True).casefold() for th in first_row.css("th")]
         if not headers:
             return False
 
@@ -62,12 +88,46 @@ class FundamentusAcionistasScraper:
         has_participacao = any("particip" in h for h in headers)
         return has_acionista and has_participacao
 
-    def _parse_table(self, html: str, ticker: str) -> list[dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    def _parse_table_regex(self, html: bytes, ticker: str) -> list[dict[str, Any]]:
+        # Fundamentus serves ISO-8859-1.
+        target = None
+        for chunk in _iter_table_slices(html):
+            if b"Acionista" in chunk and b"Particip" in chunk:
+                target = chunk
+                break
+
+        if target is None:
+            return []
+
+        items: list[dict[str, Any]] = []
+        for m in _ROW_RE.finditer(target):
+            acionista_b, participacao_b = m.groups()
+
+            # Unescape entities (&amp;, &nbsp;, ...) the DOM parser would
+            # have decoded for us.
+            acionista = unescape(acionista_b.decode("latin-1")).strip()
+            item = {
+                "site": "fundamentus",
+                "source": "acionistas",
+                "ticker": ticker,
+                "tipo": self.tipo,
+                "acionista": acionista or None,
+                "participacao": self._parse_percent_pt(unescape(participacao_b.decode("latin-1"))),
+            }
+            items.append(item)
+
+        return items
+
+    def _parse_table(self, html: bytes, ticker: str) -> list[dict[str, Any]]:
+        if _HTML_MODE == "regex":
+            items = self._parse_table_regex(html, ticker)
+            if items:
+                return items
+
+        tree = HTMLParser(html)
 
-        tables = soup.find_all("table")
         table = None
-        for t in tables:
+        for t in tree.css("table"):
             if self._is_target_table(t):
                 table = t
                 break
@@ -75,16 +135,16 @@ class FundamentusAcionistasScraper:
         if table is None:
             return []
 
-        rows = table.find_all("tr")
+        rows = table.css("tr")
         items: list[dict[str, Any]] = []
 
         for tr in rows[1:]:
-            tds = tr.find_all("td")
+            tds = tr.css("td")
             if len(tds) < 2:
                 continue
 
-            acionista = tds[0].get_text(strip=True)
-            participacao_txt = tds[1].get_text(strip=True)
+            acionista = tds[0].text(strip=True)
+            participacao_txt = tds[1].text(strip=True)
 
             item = {
                 "site": "fundamentus",
@@ -98,16 +158,31 @@ class FundamentusAcionistasScraper:
 
         return items
 
-    def scrape(self) -> list[dict[str, Any]]:
-        all_items: list[dict[str, Any]] = []
+    async def _scrape_one(self, session: aiohttp.ClientSession, ticker: str) -> list[dict[str, Any]]:
+        html = await self._fetch_async(session, self._build_url(ticker))
+        return self._parse_table(html, ticker)
 
-        for ticker in self.tickers:
-            t = (ticker or "").strip().upper()
-            if not t:
-                continue
+    async def scrape_async(
+        self, session: aiohttp.ClientSession | None = None
+    ) -> list[dict[str, Any]]:
+        if session is None:
+            async with make_session() as own_session:
+                return await self.scrape_async(own_session)
 
-            url = self._build_url(t)
-            html = self._fetch(url)
-            all_items.extend(self._parse_table(html, t))
+        if not self.tickers:
+            return []
+
+        results = await asyncio.gather(
+            *(self._scrape_one(session, t) for t in self.tickers),
+            return_exceptions=True,
+        )
 
+        all_items: list[dict[str, Any]] = []
+        for res in results:
+            if isinstance(res, BaseException):
+                continue
+            all_items.extend(res)
         return all_items
+
+    def scrape(self) -> list[dict[str, Any]]:
+        return asyncio.run(self.scrape_async())
@@ -1,43 +1,75 @@
 from __future__ import annotations
 
+import asyncio
+import os
 import re
 from dataclasses import dataclass
+from html import unescape
 from typing import Any
 
-import requests
-from bs4 import BeautifulSoup
-
-
-@dataclass(frozen=True)
+import aiohttp
+from selectolax.parser import HTMLParser
+
+from scrapers._http import make_session
+
+_INT_PT_RE = re.compile(r"^[+-]?\d+$")
+
+# Drops "R$", "%", spaces and thousands "." and maps decimal "," to "." in
+# one C-level pass instead of chained .replace() copies.
+_PT_DECIMAL_TRANS = str.maketrans(
+    {"R": "", "$": "", "%": "", ".": "", " ": "", "\xa0": "", ",": "."}
+)
+
+# "regex" extracts rows straight from the raw bytes (the page is stable,
+# machine-generated HTML); anything else keeps the DOM parse. Overridable
+# for A/B comparison; the DOM path also remains the fallback when the
+# regex finds nothing.
+_HTML_MODE = os.environ.get("FUNDAMENTUS_HTML_MODE", "regex")
+
+_ROW_RE = re.compile(
+    rb"<tr[^>]*>\s*"
+    rb"<td[^>]*>([^<]*)</td>\s*"
+    rb"<td[^>]*>([^<]*)</td>\s*"
+    rb"<td[^>]*>([^<]*)</td>\s*"
+    rb"<td[^>]*>([^<]*)</td>"
+    rb"(?:\s*<td[^>]*>\s*(?:<a[^>]*href=\"([^\"]+)\")?)?"
+)
+
+
+def _iter_table_slices(html: bytes):
+    start = 0
+    while True:
+        i = html.find(b"<table", start)
+        if i == -1:
+            return
+        j = html.find(b"</table>", i)
+        if j == -1:
+            return
+        yield html[i:j]
+        start = j + len(b"</table>")
+
+
+@dataclass(frozen=True, slots=True)
 class FundamentusInsidersScraper:
-    tickers: list[str]
+    # Expected pre-canonicalized (stripped, uppercased, deduped) by the caller.
+    tickers: tuple[str, ...]
     tipo: int = 1
 
     def _build_url(self, ticker: str) -> str:
         return f"https://www.fundamentus.com.br/insiders.php?papel={ticker}&tipo={self.tipo}"
 
-    def _fetch(self, url: str) -> str:
-        headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-        }
-        resp = requests.get(url, headers=headers, timeout=30)
-        resp.raise_for_status()
-        return resp.text
+    async def _fetch_async(self, session: aiohttp.ClientSession, url: str) -> bytes:
+        # Return the raw body; selectolax handles charset detection in C,
+        # so decoding to str here would just add a full extra pass.
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=30)) as resp:
+            resp.raise_for_status()
+            return await resp.read()
 
     @staticmethod
     def _parse_decimal_pt(value: str) -> float | None:
-        v = (value or "").strip()
+        v = (value or "").translate(_PT_DECIMAL_TRANS)
         if not v:
             return None
-        v = v.replace("R$", "").replace("%", "").strip()
-
-        # handle thousands '.' and decimal ','
-        v = v.replace(".", "").replace(",", ".")
 
         try:
             return float(v)
@@ -53,38 +85,103 @@ class FundamentusInsidersScraper:
         v = v.replace(".", "")
 
         # keep sign
-        m = re.match(r"^[+-]?\d+$", v)
+        m = _INT_PT_RE.match(v)
         if not m:
             return None
         return int(v)
 
-    def _parse_table(self, html: str, ticker: str) -> list[dict[str, Any]]:
-        soup = BeautifulSoup(html, "lxml")
+    @staticmethod
+    def _is_target_table(table: Any) -> bool:
+        first_row = table.css_first("tr")
+        if first_row is None:
+            return False
+
+        headers = [th.text(strip=True).casefold() for th in first_row.css("th")]
+        if not headers:
+            return False
+
+        return any("data" in h for h in headers) and any(
+            "quantidade" in h for h in headers
+        )
+
+    def _parse_table_regex(self, html: bytes, ticker: str) -> list[dict[str, Any]]:
+        # Fundamentus serves ISO-8859-1.
+        target = None
+        for chunk in _iter_table_slices(html):
+            if b"Quantidade" in chunk:
+                target = chunk
+                break
+
+        if target is None:
+            return []
+
+        items: list[dict[str, Any]] = []
+        for m in _ROW_RE.finditer(target):
+            date_b, quantidade_b, valor_b, preco_medio_b, href_b = m.groups()
+
+            # Unescape entities (&amp;, &nbsp;, ...) the DOM parser would
+            # have decoded for us.
+            link = unescape(href_b.decode("latin-1")) if href_b else None
+            if link and link.startswith("/"):
+                link = "https://www.fundamentus.com.br" + link
+
+            date = unescape(date_b.decode("latin-1")).strip()
+            item = {
+                "site": "fundamentus",
+                "source": "insiders",
+                "ticker": ticker,
+                "tipo": self.tipo,
+                "date": date or None,
+                "quantidade": self._parse_int_pt(unescape(quantidade_b.decode("latin-1"))),
+                "valor": self._parse_decimal_pt(unescape(valor_b.decode("latin-1"))),
+                "preco_medio": self._parse_decimal_pt(unescape(preco_medio_b.decode("latin-1"))),
+                "formulario_url": link,
+            }
+            items.append(item)
+
+        return items
+
+    def _parse_table(self, html: bytes, ticker: str) -> list[dict[str, Any]]:
+        if _HTML_MODE == "regex":
+            items = self._parse_table_regex(html, ticker)
+            if items:
+                return items
+
+        tree = HTMLParser(html)
+
+        # Prefer the table whose headers match; fall back to the first table
+        # to keep the old behavior when the page headers change.
+        table = None
+        for t in tree.css("table"):
+            if self._is_target_table(t):
+                table = t
+                break
 
-        table = soup.find("table")
+        if table is None:
+            table = tree.css_first("table")
         if table is None:
             return []
 
         # Header may vary slightly; we map by position based on the page shown:
         # Data | Quantidade | Valor (R$) | Preço Médio | Formulário
-        rows = table.find_all("tr")
+        rows = table.css("tr")
         items: list[dict[str, Any]] = []
 
         for tr in rows[1:]:
-            tds = tr.find_all("td")
+            tds = tr.css("td")
             if len(tds) < 4:
                 continue
 
-            date = tds[0].get_text(strip=True)
-            quantidade_txt = tds[1].get_text(strip=True)
-            valor_txt = tds[2].get_text(strip=True)
-            preco_medio_txt = tds[3].get_text(strip=True)
+            date = tds[0].text(strip=True)
+            quantidade_txt = tds[1].text(strip=True)
+            valor_txt = tds[2].text(strip=True)
+            preco_medio_txt = tds[3].text(strip=True)
 
             link = None
             if len(tds) >= 5:
-                a = tds[4].find("a")
-                if a and a.get("href"):
-                    link = a.get("href")
+                a = tds[4].css_first("a")
+                if a is not None:
+                    link = a.attributes.get("href")
                     if link and link.startswith("/"):
                         link = "https://www.fundamentus.com.br" + link
 
@@ -103,16 +200,31 @@ class FundamentusInsidersScraper:
 
         return items
 
-    def scrape(self) -> list[dict[str, Any]]:
-        all_items: list[dict[str, Any]] = []
+    async def _scrape_one(self, session: aiohttp.ClientSession, ticker: str) -> list[dict[str, Any]]:
+        html = await self._fetch_async(session, self._build_url(ticker))
+        return self._parse_table(html, ticker)
 
-        for ticker in self.tickers:
-            t = (ticker or "").strip().upper()
-            if not t:
-                continue
+    async def scrape_async(
+        self, session: aiohttp.ClientSession | None = None
+    ) -> list[dict[str, Any]]:
+        if session is None:
+            async with make_session() as own_session:
+                return await self.scrape_async(own_session)
+
+        if not self.tickers:
+            return []
 
-            url = self._build_url(t)
-            html = self._fetch(url)
-            all_items.extend(self._parse_table(html, t))
+        results = await asyncio.gather(
+            *(self._scrape_one(session, t) for t in self.tickers),
+            return_exceptions=True,
+        )
 
+        all_items: list[dict[str, Any]] = []
+        for res in results:
+            if isinstance(res, BaseException):
+                continue
+            all_items.extend(res)
         return all_items
+
+    def scrape(self) -> list[dict[str, Any]]:
+        return asyncio.run(self.scrape_async())
@@ -1,15 +1,165 @@
 from __future__ import annotations
 
-import re
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+from scrapers import _cache
+from scrapers._http import make_session
+
+# Cap concurrent tickers in flight so statusinvest is not hammered.
+_MAX_CONCURRENCY = 16
+
+# Re-runs within the TTL skip the network entirely (see scrapers._cache).
+_PAGE_CACHE_TTL = 6 * 3600
+_PL_CACHE_TTL = 24 * 3600
+
+# Only these tags carry the title/value blocks _parse reads.
+_STRAINER = SoupStrainer(["h3", "strong"])
+
+# Drops "R$", "%", spaces and thousands "." and maps decimal "," to "." in
+# one C-level pass; same table the fundamentus scrapers use.
+_PT_DECIMAL_TRANS = str.maketrans(
+    {"R": "", "$": "", "%": "", ".": "", " ": "", "\xa0": "", ",": "."}
+)
+
+# Static XHR headers for the indicatorhistoricallist endpoint; only the
+# per-ticker Referer (and optional Cookie) vary per request.
+_PL_HISTORICO_HEADERS = {
+    "Accept": "*/*",
+    "Cache-Control": "no-cache",
+    "Origin": "https://statusinvest.com.br",
+    "Pragma": "no-cache",
+    "X-Requested-With": "XMLHttpRequest",
+}
+
+
+class _PlaywrightSession:
+    """One lazily launched Chromium shared by every ticker that needs the
+    browser fallback, instead of a full launch/teardown per ticker.
+
+    Sync Playwright objects are greenlet-bound to the thread that created
+    them, so every call — warm-up, posts and close — runs on this
+    session's single dedicated executor thread via run(); the fallback
+    path is rare enough that serializing it never becomes the bottleneck.
+    """
+
+    def __init__(self) -> None:
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="playwright")
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._storage_file: Path | None = None
+        self._warmed = False
+        self._failed = False
+
+    def _ensure_context(self, storage_file: Path):
+        if self._context is not None or self._failed:
+            return self._context
 
+        try:
+            from playwright.sync_api import sync_playwright
+        except Exception:
+            self._failed = True
+            return None
+
+        try:
+            self._playwright = sync_playwright().start()
+            try:
+                self._browser = self._playwright.chromium.launch(headless=False)
+            except Exception:
+                self._browser = self._playwright.chromium.launch(headless=True)
+
+            context_kwargs: dict[str, Any] = {}
+            if storage_file.exists():
+                context_kwargs["storage_state"] = str(storage_file)
+
+            self._context = self._browser.new_context(**context_kwargs)
+            self._storage_file = storage_file
+        except Exception:
+            self._failed = True
+            self._close()
+        return self._context
+
+    async def run(self, fn, *args) -> Any:
+        """Run fn(*args) on the session's dedicated Playwright thread."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    def request_json(
+        self, storage_file: Path, referer_url: str, api_url: str, form: dict[str, str]
+    ) -> Any | None:
+        context = self._ensure_context(storage_file)
+        if context is None:
+            return None
+
+        try:
+            if not self._warmed:
+                # Navigate once to collect the site cookies; subsequent
+                # tickers only need the XHR post.
+                page = context.new_page()
+                page.goto(referer_url, wait_until="domcontentloaded", timeout=120_000)
+                page.close()
+                context.storage_state(path=str(storage_file))
+                self._warmed = True
+
+            resp = context.request.post(
+                api_url,
+                form=form,
+                headers={
+                    "Accept": "*/*",
+                    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+                    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+                    "Origin": "https://statusinvest.com.br",
+                    "Referer": referer_url,
+                    "X-Requested-With": "XMLHttpRequest",
+                },
+            )
+            if not resp.ok:
+                return None
+            return resp.json()
+        except Exception:
+            return None
+
+    def _close(self) -> None:
+        if self._context is not None and self._storage_file is not None:
+            try:
+                self._context.storage_state(path=str(self._storage_file))
+            except Exception:
+                pass
+        for obj in (self._context, self._browser):
+            if obj is not None:
+                try:
+                    obj.close()
+                except Exception:
+                    pass
+        if self._playwright is not None:
+            try:
+                self._playwright.stop()
+            except Exception:
+                pass
+        self._context = self._browser = self._playwright = None
+
+    async def aclose(self) -> None:
+        try:
+            await self.run(self._close)
+        finally:
+            # Nothing is queued behind close, so no need to block on it.
+            self._executor.shutdown(wait=False)
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class StatusInvestPricesScraper:
     tickers: list[str]
     cookie: str | None = None
@@ -22,67 +172,142 @@ class StatusInvestPricesScraper:
         if not t:
             return None
 
-        for k, v in data.items():
-            if isinstance(k, str) and k.strip().lower() == t and isinstance(v, list):
-                # ensure rows are dict-like
-                rows = [r for r in v if isinstance(r, dict)]
-                return rows
+        # Normalize the keys in one pass, then look the ticker up directly.
+        data_norm = {k.strip().lower(): v for k, v in data.items() if isinstance(k, str)}
+        v = data_norm.get(t)
+        if isinstance(v, list):
+            # ensure rows are dict-like
+            return [r for r in v if isinstance(r, dict)]
 
         return None
 
+    def _extract_pl(self, rows: list[Any]) -> dict[str, Any] | None:
+        """Pull the P/L indicator row out of an indicatorhistoricallist
+        response and shape it into the pl_historico dict."""
+        by_key: dict[str, dict[str, Any]] = {}
+        for r in rows:
+            if isinstance(r, dict):
+                # setdefault keeps the first row per key, like the old scans.
+                by_key.setdefault(str(r.get("key") or "").lower(), r)
+
+        pl_row = by_key.get("p_l")
+        if pl_row is None:
+            return None
+
+        return {
+            "media": self._parse_decimal_pt(str(pl_row.get("avg_F") or pl_row.get("avg") or "")),
+            "atual": self._parse_decimal_pt(str(pl_row.get("actual_F") or pl_row.get("actual") or "")),
+            "menor_valor": self._parse_decimal_pt(str(pl_row.get("minValue_F") or pl_row.get("minValue") or "")),
+            "maior_valor": self._parse_decimal_pt(str(pl_row.get("maxValue_F") or pl_row.get("maxValue") or "")),
+        }
+
     def _build_url(self, ticker: str) -> str:
         return f"https://statusinvest.com.br/acoes/{ticker.lower()}"
 
-    def _fetch(self, session: requests.Session, url: str) -> str:
+    async def _fetch_async(self, session: aiohttp.ClientSession, url: str) -> str:
+        cached = _cache.get("statusinvest", url, _PAGE_CACHE_TTL)
+        if cached is not None:
+            return cached
+
+        async with session.get(url, timeout=aiohttp.ClientTimeout(total=60)) as resp:
+            resp.raise_for_status()
+            html = await resp.text()
+
+        _cache.put("statusinvest", url, html)
+        return html
+
+    async def _fetch_pl_historico_bulk(
+        self, session: aiohttp.ClientSession, tickers: list[str]
+    ) -> dict[str, dict[str, Any]]:
+        """Fetch the P/L history for every ticker in one POST.
+
+        The indicatorhistoricallist endpoint accepts repeated codes[]
+        fields and keys its response per ticker, so one round trip covers
+        the whole list. Tickers missing from the result (or the whole
+        batch, on error) fall back to the per-ticker path.
+        """
+        url = "https://statusinvest.com.br/acao/indicatorhistoricallist"
         headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            ),
-            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
+            **_PL_HISTORICO_HEADERS,
+            "Referer": f"https://statusinvest.com.br/acoes/{tickers[0].lower()}",
         }
-        resp = session.get(url, headers=headers, timeout=60)
-        resp.raise_for_status()
-        return resp.text
 
-    def _fetch_pl_historico(self, session: requests.Session, ticker: str) -> dict[str, Any] | None:
+        if self.cookie:
+            headers["Cookie"] = self.cookie
+
+        data_payload: list[tuple[str, str]] = [("codes[]", t.upper()) for t in tickers]
+        data_payload += [("time", "5"), ("byQuarter", "false"), ("futureData", "false")]
+
+        try:
+            async with session.post(
+                url, data=data_payload, headers=headers, timeout=aiohttp.ClientTimeout(total=60)
+            ) as resp:
+                if resp.status != 200:
+                    return {}
+                payload = await resp.json(content_type=None) or {}
+        except (aiohttp.ClientError, TimeoutError, ValueError):
+            # aiohttp's total timeout raises plain TimeoutError, not a
+            # ClientError; a stalled bulk response must not sink the gather.
+            return {}
+
+        data = payload.get("data") if isinstance(payload, dict) else None
+        if not isinstance(data, dict):
+            return {}
+
+        out: dict[str, dict[str, Any]] = {}
+        for k, rows in data.items():
+            if not isinstance(k, str) or not isinstance(rows, list):
+                continue
+
+            pl = self._extract_pl(rows)
+            if pl is not None:
+                out[k.strip().upper()] = pl
+        return out
+
+    async def _fetch_pl_historico_async(
+        self, session: aiohttp.ClientSession, ticker: str
+    ) -> dict[str, Any] | None:
+        t_lower = ticker.lower()
+        t_upper = ticker.upper()
+
         url = "https://statusinvest.com.br/acao/indicatorhistoricallist"
         headers = {
-            "User-Agent": (
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/122.0.0.0 Safari/537.36"
-            ),
-            "Accept": "*/*",
-            "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-            "Cache-Control": "no-cache",
-            "Origin": "https://statusinvest.com.br",
-            "Pragma": "no-cache",
-            "Referer": f"https://statusinvest.com.br/acoes/{ticker.lower()}",
-            "X-Requested-With": "XMLHttpRequest",
-            "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
+            **_PL_HISTORICO_HEADERS,
+            "Referer": f"https://statusinvest.com.br/acoes/{t_lower}",
         }
 
         if self.cookie:
             headers["Cookie"] = self.cookie
 
-        payload = None
-        for code in (ticker.upper(), ticker.lower()):
-            data_payload: list[tuple[str, str]] = [
-                ("codes[]", code),
-                ("time", "5"),
-                ("byQuarter", "false"),
-                ("futureData", "false"),
-            ]
-            resp = session.post(url, data=data_payload, headers=headers, timeout=60)
-            if resp.status_code != 200:
-                continue
+        cache_key = f"{url}|{t_upper}"
+        cached = _cache.get("statusinvest", cache_key, _PL_CACHE_TTL)
+        if cached is not None:
             try:
-                payload = resp.json() or {}
+                payload = json.loads(cached)
             except ValueError:
-                continue
-            break
+                payload = None
+        else:
+            payload = None
+            for code in (t_upper, t_lower):
+                data_payload: list[tuple[str, str]] = [
+                    ("codes[]", code),
+                    ("time", "5"),
+                    ("byQuarter", "false"),
+                    ("futureData", "false"),
+                ]
+                async with session.post(
+                    url, data=data_payload, headers=headers, timeout=aiohttp.ClientTimeout(total=60)
+                ) as resp:
+                    if resp.status != 200:
+                        continue
+                    try:
+                        payload = await resp.json(content_type=None) or {}
+                    except ValueError:
+                        continue
+                break
+
+            if isinstance(payload, dict):
+                _cache.put("statusinvest", cache_key, json.dumps(payload))
 
         if not isinstance(payload, dict):
             return None
@@ -91,31 +316,16 @@ class StatusInvestPricesScraper:
         if not isinstance(data, dict):
             return None
 
-        ticker_key = next((k for k in data.keys() if k.strip().lower() == ticker.lower()), None)
-        if ticker_key is None:
-            return None
-
-        rows = data.get(ticker_key)
+        data_norm = {k.strip().lower(): v for k, v in data.items() if isinstance(k, str)}
+        rows = data_norm.get(t_lower)
         if not isinstance(rows, list):
             return None
 
-        pl_row = None
-        for r in rows:
-            if isinstance(r, dict) and str(r.get("key") or "").lower() == "p_l":
-                pl_row = r
-                break
-
-        if not isinstance(pl_row, dict):
-            return None
+        return self._extract_pl(rows)
 
-        return {
-            "media": self._parse_decimal_pt(str(pl_row.get("avg_F") or pl_row.get("avg") or "")),
-            "atual": self._parse_decimal_pt(str(pl_row.get("actual_F") or pl_row.get("actual") or "")),
-            "menor_valor": self._parse_decimal_pt(str(pl_row.get("minValue_F") or pl_row.get("minValue") or "")),
-            "maior_valor": self._parse_decimal_pt(str(pl_row.get("maxValue_F") or pl_row.get("maxValue") or "")),
-        }
-
-    def _maybe_fetch_pl_historico_with_browser(self, ticker: str) -> dict[str, Any] | None:
+    def _maybe_fetch_pl_historico_with_browser(
+        self, ticker: str, browser: _PlaywrightSession
+    ) -> dict[str, Any] | None:
         if not self.use_browser_fallback:
             return None
 
@@ -123,62 +333,17 @@ class StatusInvestPricesScraper:
         if not storage_path:
             return None
 
-        storage_file = Path(storage_path)
-        try:
-            from playwright.sync_api import sync_playwright
-        except Exception:
-            return None
-
-        api_url = "https://statusinvest.com.br/acao/indicatorhistoricallist"
-        referer_url = f"https://statusinvest.com.br/acoes/{ticker.lower()}"
-
-        with sync_playwright() as p:
-            try:
-                browser = p.chromium.launch(headless=False)
-            except Exception:
-                browser = p.chromium.launch(headless=True)
-
-            context_kwargs: dict[str, Any] = {}
-            if storage_file.exists():
-                context_kwargs["storage_state"] = str(storage_file)
-
-            context = browser.new_context(**context_kwargs)
-            page = context.new_page()
-            page.goto(referer_url, wait_until="domcontentloaded", timeout=120_000)
-            context.storage_state(path=str(storage_file))
-
-            payload = {
+        payload_json = browser.request_json(
+            Path(storage_path),
+            f"https://statusinvest.com.br/acoes/{ticker.lower()}",
+            "https://statusinvest.com.br/acao/indicatorhistoricallist",
+            {
                 "codes[]": ticker.upper(),
                 "time": "5",
                 "byQuarter": "false",
                 "futureData": "false",
-            }
-
-            resp = context.request.post(
-                api_url,
-                form=payload,
-                headers={
-                    "Accept": "*/*",
-                    "Accept-Language": "pt-BR,pt;q=0.9,en-US;q=0.8,en;q=0.7",
-                    "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
-                    "Origin": "https://statusinvest.com.br",
-                    "Referer": referer_url,
-                    "X-Requested-With": "XMLHttpRequest",
-                },
-            )
-
-            if not resp.ok:
-                browser.close()
-                return None
-
-            try:
-                payload_json = resp.json()
-            except Exception:
-                browser.close()
-                return None
-
-            context.storage_state(path=str(storage_file))
-            browser.close()
+            },
+        )
 
         if not isinstance(payload_json, dict):
             return None
@@ -191,63 +356,77 @@ class StatusInvestPricesScraper:
         if not isinstance(rows, list):
             return None
 
-        pl_row = None
-        for r in rows:
-            if isinstance(r, dict) and str(r.get("key") or "").lower() == "p_l":
-                pl_row = r
-                break
-
-        if not isinstance(pl_row, dict):
-            return None
-
-        return {
-            "media": self._parse_decimal_pt(str(pl_row.get("avg_F") or pl_row.get("avg") or "")),
-            "atual": self._parse_decimal_pt(str(pl_row.get("actual_F") or pl_row.get("actual") or "")),
-            "menor_valor": self._parse_decimal_pt(str(pl_row.get("minValue_F") or pl_row.get("minValue") or "")),
-            "maior_valor": self._parse_decimal_pt(str(pl_row.get("maxValue_F") or pl_row.get("maxValue") or "")),
-        }
+        return self._extract_pl(rows)
 
     @staticmethod
     def _parse_decimal_pt(value: str) -> float | None:
         v = (value or "").strip()
         if not v:
             return None
-        v = v.replace("R$", "").replace("%", "").strip()
-        v = v.replace(".", "").replace(",", ".")
+
+        # Fast path: most page values are bare numbers like "31,88" with no
+        # prefix, suffix or thousands separator.
+        if v[0].isdigit() and "." not in v:
+            try:
+                return float(v.replace(",", "."))
+            except ValueError:
+                pass
+
+        v = v.translate(_PT_DECIMAL_TRANS)
+        if not v:
+            return None
+
         try:
             return float(v)
         except ValueError:
             return None
 
     @staticmethod
-    def _find_value_by_title(soup: BeautifulSoup, title: str) -> str | None:
+    def _extract_title_value_map(html: str) -> dict[str, str]:
         # The site renders blocks like:
         # <h3 class="title">Máx. 52 semanas</h3> ... <strong class="value">31,88</strong>
-        h3 = soup.find("h3", string=lambda s: isinstance(s, str) and s.strip().lower() == title.lower())
-        if not h3:
-            return None
-
-        node = h3
-        for _ in range(8):
-            if not node:
-                break
-
-            strong = node.find("strong", class_=re.compile(r"\bvalue\b"))
-            if strong:
-                return strong.get_text(strip=True)
-
-            node = node.parent
-
-        return None
+        # Keys are lowercased once here so lookups are plain dict gets; the
+        # first occurrence of a title wins, matching the old linear scans.
+        values: dict[str, str] = {}
+        if LexborHTMLParser is not None:
+            # Lexbor parses and traverses in C; mirror the old bs4 walk of
+            # up to eight ancestors from each title to its value.
+            for h3 in LexborHTMLParser(html).css("h3.title"):
+                node = h3.parent
+                for _ in range(8):
+                    if node is None:
+                        break
+                    strong = node.css_first("strong.value")
+                    if strong is not None:
+                        values.setdefault(h3.text(strip=True).lower(), strong.text(strip=True))
+                        break
+                    node = node.parent
+            return values
+
+        # bs4 fallback: the strainer keeps only those two tags, so bs4
+        # skips building the rest of the (hundreds of KB) tree. Sibling and
+        # ancestor relations are lost under a strainer, so pair each title
+        # with the next value in document order instead of walking parents.
+        soup = BeautifulSoup(html, "lxml", parse_only=_STRAINER)
+
+        pending: str | None = None
+        for el in soup.find_all(["h3", "strong"]):
+            classes = el.get("class") or []
+            if el.name == "h3" and "title" in classes:
+                pending = el.get_text(strip=True)
+            elif el.name == "strong" and "value" in classes and pending is not None:
+                values.setdefault(pending.lower(), el.get_text(strip=True))
+                pending = None
+        return values
 
     def _parse(self, html: str, ticker: str, url: str) -> dict[str, Any] | None:
-        soup = BeautifulSoup(html, "lxml")
+        values = self._extract_title_value_map(html)
 
-        valor_atual_txt = self._find_value_by_title(soup, "Valor atual")
-        max_52_txt = self._find_value_by_title(soup, "Máx. 52 semanas")
-        dy_txt = self._find_value_by_title(soup, "D.Y")
-        pl_txt = self._find_value_by_title(soup, "P/L")
-        m_liquida_txt = self._find_value_by_title(soup, "M. Líquida")
+        valor_atual_txt = values.get("valor atual")
+        max_52_txt = values.get("máx. 52 semanas")
+        dy_txt = values.get("d.y")
+        pl_txt = values.get("p/l")
+        m_liquida_txt = values.get("m. líquida")
 
         if not valor_atual_txt and not max_52_txt and not dy_txt and not pl_txt and not m_liquida_txt:
             return None
@@ -265,36 +444,73 @@ class StatusInvestPricesScraper:
             "pl_historico": None,
         }
 
-    def scrape(self) -> list[dict[str, Any]]:
-        items: list[dict[str, Any]] = []
-
-        for ticker in self.tickers:
-            t = (ticker or "").strip().upper()
-            if not t:
-                continue
+    async def _process_ticker(
+        self,
+        session: aiohttp.ClientSession,
+        semaphore: asyncio.Semaphore,
+        browser: _PlaywrightSession,
+        pl_map: dict[str, dict[str, Any]],
+        ticker: str,
+    ) -> dict[str, Any] | None:
+        async with semaphore:
+            url = self._build_url(ticker)
 
-            url = self._build_url(t)
-
-            session = requests.Session()
             try:
-                html = self._fetch(session, url)
-            except requests.HTTPError as e:
-                resp = getattr(e, "response", None)
-                if resp is not None and getattr(resp, "status_code", None) == 404:
-                    continue
-                continue
-            except requests.RequestException:
-                continue
+                html = await self._fetch_async(session, url)
+            except (aiohttp.ClientError, TimeoutError):
+                return None
 
-            item = self._parse(html, t, url)
-            if item:
+            item = self._parse(html, ticker, url)
+            if not item:
+                return None
+
+            item["pl_historico"] = pl_map.get(ticker)
+            if item["pl_historico"] is None:
                 try:
-                    item["pl_historico"] = self._fetch_pl_historico(session, t)
-                except requests.RequestException:
+                    item["pl_historico"] = await self._fetch_pl_historico_async(session, ticker)
+                except (aiohttp.ClientError, TimeoutError):
                     item["pl_historico"] = None
 
-                if item.get("pl_historico") is None:
-                    item["pl_historico"] = self._maybe_fetch_pl_historico_with_browser(t)
-                items.append(item)
+            if item.get("pl_historico") is None:
+                # Playwright is synchronous and thread-bound; run the
+                # fallback on the session's dedicated thread.
+                item["pl_historico"] = await browser.run(
+                    self._maybe_fetch_pl_historico_with_browser, ticker, browser
+                )
+            return item
+
+    async def scrape_async(
+        self, session: aiohttp.ClientSession | None = None
+    ) -> list[dict[str, Any]]:
+        if session is None:
+            async with make_session() as own_session:
+                return await self.scrape_async(own_session)
+
+        # Canonicalize once and dedup (order-preserving) so a repeated
+        # ticker costs one page fetch, not several.
+        tickers = list(
+            dict.fromkeys(t for t in ((x or "").strip().upper() for x in self.tickers) if t)
+        )
+        if not tickers:
+            return []
+
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENCY)
+        browser = _PlaywrightSession()
+        pl_map = await self._fetch_pl_historico_bulk(session, tickers)
+        try:
+            results = await asyncio.gather(
+                *(self._process_ticker(session, semaphore, browser, pl_map, t) for t in tickers),
+                return_exceptions=True,
+            )
+        finally:
+            await browser.aclose()
 
+        items: list[dict[str, Any]] = []
+        for res in results:
+            if isinstance(res, BaseException) or res is None:
+                continue
+            items.append(res)
         return items
+
+    def scrape(self) -> list[dict[str, Any]]:
+        return asyncio.run(self.scrape_async())
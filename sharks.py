@@ -1,8 +1,24 @@
 import argparse
-import json
+import functools
 import re
+import sys
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from utils import json_dumps, json_loads
+
+# Below this many files the fork/pickle overhead of a process pool costs
+# more than it saves; load serially.
+_PARALLEL_LOAD_THRESHOLD = 20
+
+
+# Compiled once at import; _normalize_shark_name runs for every
+# shareholder row, so per-call re.compile cache lookups add up.
+_RE_QUOTES = re.compile(r"[\"'`´]")
+_RE_NONALNUM = re.compile(r"[^a-z0-9]+")
+_RE_WS = re.compile(r"\s+")
+_RE_ACIONISTAS = re.compile(r"^([a-z0-9]+)\.acionistas\.json$", re.IGNORECASE)
 
 _SUFFIX_STOPWORDS: set[str] = {
     "inc",
@@ -24,14 +40,17 @@ _SUFFIX_STOPWORDS: set[str] = {
 }
 
 
+@functools.lru_cache(maxsize=8192)
 def _normalize_shark_name(name: str) -> str:
+    # The same institutional names recur across most tickers, so the cache
+    # turns repeat normalizations into a dict hit.
     s = (name or "").strip().lower()
     if not s:
         return ""
 
-    s = re.sub(r"[\"'`´]", "", s)
-    s = re.sub(r"[^a-z0-9]+", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
+    s = _RE_QUOTES.sub("", s)
+    s = _RE_NONALNUM.sub(" ", s)
+    s = _RE_WS.sub(" ", s).strip()
     if not s:
         return ""
 
@@ -44,26 +63,41 @@ def _normalize_shark_name(name: str) -> str:
         filtered.append(t)
 
     if not filtered:
-        return tokens[0]
+        return sys.intern(tokens[0])
+
+    return sys.intern(" ".join(filtered))
+
+
+def _load_one(path: Path) -> tuple[str, dict | None]:
+    # Module-level so ProcessPoolExecutor can pickle it.
+    try:
+        return path.name, json_loads(path.read_bytes())
+    except Exception:
+        return path.name, None
+
+
+def _load_payloads(paths: list[Path]) -> list[tuple[str, dict | None]]:
+    if len(paths) < _PARALLEL_LOAD_THRESHOLD:
+        return [_load_one(p) for p in paths]
 
-    return " ".join(filtered)
+    with ProcessPoolExecutor() as pool:
+        return list(pool.map(_load_one, paths))
 
 
 def build_sharks(out_dir: Path) -> list[dict]:
-    accionistas_map: dict[str, set[str]] = {}
-    display_name_counts: dict[str, dict[str, int]] = {}
+    accionistas_map: defaultdict[str, set[str]] = defaultdict(set)
+    display_name_counts: defaultdict[str, Counter[str]] = defaultdict(Counter)
 
-    for p in sorted(out_dir.glob("*.acionistas.json")):
-        try:
-            payload = json.loads(p.read_text(encoding="utf-8"))
-        except Exception:
+    paths = sorted(out_dir.glob("*.acionistas.json"))
+    for name, payload in _load_payloads(paths):
+        if not isinstance(payload, dict):
             continue
 
-        ticker = str(payload.get("ticker") or "").strip().upper()
+        ticker = sys.intern(str(payload.get("ticker") or "").strip().upper())
         if not ticker:
-            m = re.match(r"^([a-z0-9]+)\.acionistas\.json$", p.name, re.IGNORECASE)
+            m = _RE_ACIONISTAS.match(name)
             if m:
-                ticker = m.group(1).strip().upper()
+                ticker = sys.intern(m.group(1).strip().upper())
 
         items = payload.get("items")
         if not ticker or not isinstance(items, list):
@@ -72,7 +106,9 @@ def build_sharks(out_dir: Path) -> list[dict]:
         for item in items:
             if not isinstance(item, dict):
                 continue
-            name_raw = str(item.get("acionista") or "").strip()
+            # Interning collapses the many duplicate ticker/name strings to
+            # one object each, so the dict updates below compare by pointer.
+            name_raw = sys.intern(str(item.get("acionista") or "").strip())
             if not name_raw:
                 continue
 
@@ -80,17 +116,18 @@ def build_sharks(out_dir: Path) -> list[dict]:
             if not key:
                 continue
 
-            accionistas_map.setdefault(key, set()).add(ticker)
-            display_name_counts.setdefault(key, {})
-            display_name_counts[key][name_raw] = display_name_counts[key].get(name_raw, 0) + 1
+            accionistas_map[key].add(ticker)
+            display_name_counts[key][name_raw] += 1
 
     sharks: list[dict] = []
     for shark_key, tickers in accionistas_map.items():
         items = sorted(tickers)
 
-        name_counts = display_name_counts.get(shark_key) or {}
+        name_counts = display_name_counts.get(shark_key)
         if name_counts:
-            shark_name = sorted(name_counts.items(), key=lambda x: (-x[1], x[0]))[0][0]
+            # Single O(n) pass instead of sorting every spelling; ties still
+            # break on the lexicographically smallest name.
+            shark_name = min(name_counts.items(), key=lambda x: (-x[1], x[0]))[0]
         else:
             shark_name = shark_key
 
@@ -118,10 +155,7 @@ def main() -> int:
         return 0
 
     out_path = out_dir / "sharks.json"
-    out_path.write_text(
-        json.dumps(sharks, ensure_ascii=False, indent=2),
-        encoding="utf-8",
-    )
+    out_path.write_bytes(json_dumps(sharks))
     print(f"Wrote {out_path} ({len(sharks)} sharks)")
     return 0
 
@@ -5,59 +5,17 @@ import sys
 from datetime import datetime, timezone
 from pathlib import Path
 
-import requests
-import yaml
-
 PROJECT_ROOT = Path(__file__).parent
 if str(PROJECT_ROOT) not in sys.path:
     sys.path.insert(0, str(PROJECT_ROOT))
 
 from scrapers.statusinvest_prices import StatusInvestPricesScraper
-
-
-def _normalize_tickers(tickers):
-    if not isinstance(tickers, list):
-        return []
-    result = []
-    seen = set()
-    for t in tickers:
-        v = str(t or "").strip().upper()
-        if not v or v in seen:
-            continue
-        seen.add(v)
-        result.append(v)
-    return result
-
-
-def _fetch_tickers_from_endpoint(url: str) -> list[str]:
-    u = str(url or "").strip()
-    if not u:
-        return []
-    resp = requests.get(u, timeout=10)
-    resp.raise_for_status()
-    payload = resp.json()
-    tickers = payload.get("tickers") if isinstance(payload, dict) else None
-    return _normalize_tickers(tickers)
-
-
-def _get_tickers(config: dict, site_cfg: dict) -> list[str]:
-    endpoint = site_cfg.get("tickers_endpoint") or config.get("tickers_endpoint")
-    if endpoint:
-        try:
-            from_endpoint = _fetch_tickers_from_endpoint(str(endpoint))
-            if from_endpoint:
-                return from_endpoint
-        except Exception:
-            pass
-    tickers = site_cfg.get("tickers")
-    if tickers is None:
-        tickers = config.get("tickers", [])
-    return _normalize_tickers(tickers)
+from utils import get_tickers, load_yaml
 
 
 def run_statusinvest(config_path: str, output_path: str) -> dict:
     cfg_path = Path(config_path)
-    config = yaml.safe_load(cfg_path.read_text(encoding="utf-8")) or {}
+    config = load_yaml(cfg_path)
     sites = config.get("sites", {}) or {}
     site_cfg = sites.get("statusinvest_prices", {}) or {}
 
@@ -68,7 +26,7 @@ def run_statusinvest(config_path: str, output_path: str) -> dict:
             "config": str(cfg_path),
         }
 
-    tickers = _get_tickers(config, site_cfg)
+    tickers = get_tickers(config, site_cfg)
 
     if not tickers:
         return {
@@ -1,19 +1,28 @@
 import argparse
 import base64
+import bisect
+import functools
 import json
 import mimetypes
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date
 from pathlib import Path
 from typing import Any
 
 import requests
-import yaml
 from dotenv import load_dotenv
 from supabase import create_client
 
+from utils import json_loads, load_yaml
+
+# Rows carry full scraper payloads plus base64 images, so one giant upsert
+# request can get slow or rejected; send them in small parallel batches.
+_UPSERT_BATCH_SIZE = 25
+_UPSERT_MAX_WORKERS = 4
+
 
 @dataclass(frozen=True)
 class UploadConfig:
@@ -27,7 +36,7 @@ class UploadConfig:
 
 
 def _load_config(path: Path) -> dict[str, Any]:
-    return yaml.safe_load(path.read_text(encoding="utf-8")) or {}
+    return load_yaml(path)
 
 
 def _get_tickers(config: dict[str, Any], only: list[str] | None) -> list[str] | None:
@@ -99,15 +108,45 @@ def _infer_tickers_from_outputs(outputs_dir: Path) -> list[str]:
 
 
 def _read_json(path: Path) -> Any:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return json_loads(path.read_bytes())
+
+
+@functools.lru_cache(maxsize=None)
+def _dir_names(base_dir: Path) -> frozenset[str]:
+    # One scandir per directory per run; the per-ticker file probes then
+    # become set lookups instead of stat() calls.
+    try:
+        with os.scandir(base_dir) as it:
+            return frozenset(e.name for e in it)
+    except OSError:
+        return frozenset()
 
 
+@functools.lru_cache(maxsize=None)
+def _mt5_pngs(mt5_dir: Path) -> tuple[tuple[str, Path], ...]:
+    # Sorted (lowercase name, path) pairs so per-ticker prefix matches are
+    # a bisect into one cached listing instead of re-scanning the dir.
+    entries: list[tuple[str, Path]] = []
+    try:
+        with os.scandir(mt5_dir) as it:
+            for e in it:
+                if e.is_file() and e.name.lower().endswith(".png"):
+                    entries.append((e.name.lower(), Path(e.path)))
+    except OSError:
+        return ()
+    entries.sort()
+    return tuple(entries)
+
+
+@functools.lru_cache(maxsize=None)
 def _maybe_read_outputs_json(outputs_dir: Path, file_name: str) -> Any | None:
-    p = outputs_dir / file_name
-    if not p.exists():
+    # Memoized: the common files (volume/magic_formula/sharks) and any
+    # repeated ticker reads hit the disk only once per run. Cached payloads
+    # are serialized as-is and never mutated.
+    if file_name not in _dir_names(outputs_dir):
         return None
     try:
-        return _read_json(p)
+        return _read_json(outputs_dir / file_name)
     except Exception:
         return None
 
@@ -115,11 +154,10 @@ def _maybe_read_outputs_json(outputs_dir: Path, file_name: str) -> Any | None:
 def _maybe_read_json_from_dir(base_dir: Path | None, file_name: str) -> Any | None:
     if base_dir is None:
         return None
-    p = base_dir / file_name
-    if not p.exists():
+    if file_name not in _dir_names(base_dir):
         return None
     try:
-        return _read_json(p)
+        return _read_json(base_dir / file_name)
     except Exception:
         return None
 
@@ -129,38 +167,28 @@ def _encode_image_base64(path: Path) -> str:
     mime, _ = mimetypes.guess_type(str(path))
     if not mime:
         mime = "application/octet-stream"
-    b64 = base64.b64encode(raw).decode("ascii")
-    return f"data:{mime};base64,{b64}"
+    # Join prefix and payload while still bytes; the old f-string decoded
+    # then re-copied the whole base64 blob a second time.
+    prefix = f"data:{mime};base64,".encode("ascii")
+    return (prefix + base64.b64encode(raw)).decode("ascii")
 
 
 def _maybe_read_mt5_image(mt5_dir: Path | None, ticker: str) -> str | None:
     if mt5_dir is None:
         return None
-    if not mt5_dir.exists() or not mt5_dir.is_dir():
-        return None
 
-    t = ticker.strip().upper()
-    prefix = t.lower()
-    expected = f"{prefix}_d1.png"
-
-    candidates: list[Path] = []
-    try:
-        for p in mt5_dir.iterdir():
-            if not p.is_file():
-                continue
-            name = p.name.lower()
-            if not name.endswith(".png"):
-                continue
-            if name == expected:
-                candidates.append(p)
-                continue
-            if not name.startswith(prefix):
-                continue
-            candidates.append(p)
-    except Exception:
+    prefix = ticker.strip().lower()
+    if not prefix:
         return None
 
-    for p in sorted(candidates, key=lambda x: x.name.lower()):
+    # The listing is sorted, so every name starting with the ticker prefix
+    # sits in one contiguous run; candidates still come back in the same
+    # name order the old per-ticker scan produced.
+    pngs = _mt5_pngs(mt5_dir)
+    start = bisect.bisect_left(pngs, (prefix,))
+    for name, p in pngs[start:]:
+        if not name.startswith(prefix):
+            break
         try:
             return _encode_image_base64(p)
         except Exception:
@@ -222,7 +250,12 @@ def _upsert_rows(cfg: UploadConfig) -> None:
             "No tickers found. Provide --ticker, set tickers in config.yaml, or ensure outputs/*.json exist"
         )
 
-    rows = [_build_row(cfg.outputs_dir, cfg.mt5_files_dir, t) for t in tickers]
+    # Each row is a handful of small file reads plus a possible image
+    # encode; threads overlap the IO while map preserves ticker order.
+    with ThreadPoolExecutor(max_workers=min(32, len(tickers))) as pool:
+        rows = list(
+            pool.map(lambda t: _build_row(cfg.outputs_dir, cfg.mt5_files_dir, t), tickers)
+        )
 
     common_row = _build_common_row(cfg.outputs_dir, cfg.common_id)
 
@@ -235,13 +268,19 @@ def _upsert_rows(cfg: UploadConfig) -> None:
 
     supabase = create_client(cfg.supabase_url, cfg.supabase_key)
 
-    resp = supabase.from_("indicators").upsert(rows, on_conflict="ticker").execute()
-    if getattr(resp, "error", None):
-        raise SystemExit(str(resp.error))
+    def _upsert_batch(batch: list[dict[str, Any]]) -> int | None:
+        resp = supabase.from_("indicators").upsert(batch, on_conflict="ticker").execute()
+        if getattr(resp, "error", None):
+            raise SystemExit(str(resp.error))
+        data = getattr(resp, "data", None)
+        return len(data) if isinstance(data, list) else None
+
+    batches = [rows[i : i + _UPSERT_BATCH_SIZE] for i in range(0, len(rows), _UPSERT_BATCH_SIZE)]
+    with ThreadPoolExecutor(max_workers=min(_UPSERT_MAX_WORKERS, len(batches))) as pool:
+        counts = list(pool.map(_upsert_batch, batches))
 
-    data = getattr(resp, "data", None)
-    if isinstance(data, list):
-        print(f"Upserted {len(data)} rows")
+    if all(c is not None for c in counts):
+        print(f"Upserted {sum(counts)} rows")
     else:
         print("Upsert completed")
 
@@ -0,0 +1,96 @@
+"""Shared config/ticker helpers for the CLI entry points."""
+from __future__ import annotations
+
+import functools
+from pathlib import Path
+
+import requests
+import yaml
+
+# Fastest available serializer wins: orjson (Rust), then ujson (C), then
+# stdlib. All three paths return UTF-8 bytes so callers write uniformly.
+try:
+    import orjson
+
+    # Bound once so every output write shares the same serializer options
+    # instead of re-parsing the option kwarg per call.
+    json_dumps = functools.partial(
+        orjson.dumps,
+        option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE,
+    )
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+
+        def json_dumps(obj) -> bytes:
+            return (ujson.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+        json_loads = ujson.loads
+    except ImportError:
+        import json
+
+        def json_dumps(obj) -> bytes:
+            return (json.dumps(obj, ensure_ascii=False, indent=2) + "\n").encode("utf-8")
+
+        json_loads = json.loads
+
+# libyaml's C loader parses config files an order of magnitude faster than
+# the pure-Python SafeLoader; not every PyYAML build ships it.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def load_yaml(path: Path) -> dict:
+    loaded = yaml.load(path.read_text(encoding="utf-8"), Loader=_YAML_LOADER)
+    return loaded or {}
+
+
+@functools.lru_cache(maxsize=None)
+def _normalize(tickers: tuple[str, ...]) -> tuple[str, ...]:
+    result: list[str] = []
+    seen: set[str] = set()
+    for t in tickers:
+        v = t.strip().upper()
+        if not v or v in seen:
+            continue
+        seen.add(v)
+        result.append(v)
+    return tuple(result)
+
+
+def normalize_tickers(tickers: object) -> tuple[str, ...]:
+    if not isinstance(tickers, (list, tuple)):
+        return ()
+    # Stringify before caching: non-scalar entries (a common YAML typo like
+    # "- PETR4: x" yields a dict) would make the lru_cache key unhashable.
+    return _normalize(tuple(t if isinstance(t, str) else str(t or "") for t in tickers))
+
+
+@functools.lru_cache(maxsize=None)
+def _fetch_tickers_from_endpoint(url: str) -> tuple[str, ...]:
+    resp = requests.get(url, timeout=10)
+    resp.raise_for_status()
+    payload = resp.json()
+    tickers = payload.get("tickers") if isinstance(payload, dict) else None
+    return normalize_tickers(tickers)
+
+
+def get_tickers(config: dict, site_cfg: dict) -> tuple[str, ...]:
+    """Resolve the ticker list for one site, canonicalized and deduped.
+
+    The endpoint fetch and the normalization are cached, so calling this
+    once per site re-does the work only for inputs not seen before.
+    """
+    endpoint = str(site_cfg.get("tickers_endpoint") or config.get("tickers_endpoint") or "").strip()
+    if endpoint:
+        try:
+            from_endpoint = _fetch_tickers_from_endpoint(endpoint)
+            if from_endpoint:
+                return from_endpoint
+        except Exception:
+            pass
+
+    tickers = site_cfg.get("tickers")
+    if tickers is None:
+        tickers = config.get("tickers", [])
+    return normalize_tickers(tickers)